@@ -45,6 +45,9 @@ setuptools.setup(
             'google-auth>=1.6',
             'google-oauth>=1.0',
         ],
+        'orjson': [
+            'orjson>=3.0',
+        ],
     },
     python_requires='>=3.6',
     install_requires=[
@@ -1,39 +1,167 @@
 """Application Programming Interface (API)"""
 import re
+import json
 import logging
+import threading
 from xml.etree.ElementTree import (
     Element,
     fromstring
 )
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
 from http import HTTPStatus
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import quote_plus, urlsplit
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
+    FrozenSet,
+    Iterable,
     Iterator,
     List,
     Optional,
-    Set,
     Sequence,
     Union,
     Tuple,
+    TYPE_CHECKING,
 )
 from warnings import warn
 
 import requests
 import retrying
-import pydicom
+from urllib3.util.retry import Retry
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
 
 from dicomweb_client.error import DICOMJSONError
 
+if TYPE_CHECKING:
+    # pydicom is imported lazily where it is needed, such that search-only
+    # workloads don't pay for importing it.
+    import pydicom
+
 
 logger = logging.getLogger(__name__)
 
 
-def load_json_dataset(dataset: Dict[str, dict]) -> pydicom.dataset.Dataset:
+# Media types that are supported for the different resources. Mappings are
+# from transfer syntax UIDs to the corresponding media types. They are
+# constant and therefore only created once rather than for every request.
+_MULTIPART_APPLICATION_DICOM_MEDIA_TYPES: Dict[str, str] = {
+    uid: 'application/dicom'
+    for uid in (
+        '1.2.840.10008.1.2.1',
+        '1.2.840.10008.1.2.5',
+        '1.2.840.10008.1.2.4.50',
+        '1.2.840.10008.1.2.4.51',
+        '1.2.840.10008.1.2.4.57',
+        '1.2.840.10008.1.2.4.70',
+        '1.2.840.10008.1.2.4.80',
+        '1.2.840.10008.1.2.4.81',
+        '1.2.840.10008.1.2.4.90',
+        '1.2.840.10008.1.2.4.91',
+        '1.2.840.10008.1.2.4.92',
+        '1.2.840.10008.1.2.4.93',
+        '1.2.840.10008.1.2.4.100',
+        '1.2.840.10008.1.2.4.101',
+        '1.2.840.10008.1.2.4.102',
+        '1.2.840.10008.1.2.4.103',
+        '1.2.840.10008.1.2.4.104',
+        '1.2.840.10008.1.2.4.105',
+        '1.2.840.10008.1.2.4.106',
+    )
+}
+_MULTIPART_APPLICATION_OCTET_STREAM_MEDIA_TYPES: Dict[str, str] = {
+    '1.2.840.10008.1.2.1': 'application/octet-stream',
+}
+_MULTIPART_IMAGE_MEDIA_TYPES: Dict[str, str] = {
+    '1.2.840.10008.1.2.5': 'image/x-dicom-rle',
+    '1.2.840.10008.1.2.4.50': 'image/jpeg',
+    '1.2.840.10008.1.2.4.51': 'image/jpeg',
+    '1.2.840.10008.1.2.4.57': 'image/jpeg',
+    '1.2.840.10008.1.2.4.70': 'image/jpeg',
+    '1.2.840.10008.1.2.4.80': 'image/x-jls',
+    '1.2.840.10008.1.2.4.81': 'image/x-jls',
+    '1.2.840.10008.1.2.4.90': 'image/jp2',
+    '1.2.840.10008.1.2.4.91': 'image/jp2',
+    '1.2.840.10008.1.2.4.92': 'image/jpx',
+    '1.2.840.10008.1.2.4.93': 'image/jpx',
+}
+_MULTIPART_RENDERED_IMAGE_MEDIA_TYPES = frozenset({
+    'image/jpeg',
+    'image/gif',
+    'image/png',
+    'image/jp2',
+})
+_MULTIPART_VIDEO_MEDIA_TYPES: Dict[str, str] = {
+    '1.2.840.10008.1.2.4.100': 'video/mpeg2',
+    '1.2.840.10008.1.2.4.101': 'video/mpeg2',
+    '1.2.840.10008.1.2.4.102': 'video/mp4',
+    '1.2.840.10008.1.2.4.103': 'video/mp4',
+    '1.2.840.10008.1.2.4.104': 'video/mp4',
+    '1.2.840.10008.1.2.4.105': 'video/mp4',
+    '1.2.840.10008.1.2.4.106': 'video/mp4',
+}
+# Media types of the above mappings for lookup by value
+_MULTIPART_APPLICATION_DICOM_MEDIA_TYPE_VALUES = frozenset(
+    _MULTIPART_APPLICATION_DICOM_MEDIA_TYPES.values()
+)
+_MULTIPART_APPLICATION_OCTET_STREAM_MEDIA_TYPE_VALUES = frozenset(
+    _MULTIPART_APPLICATION_OCTET_STREAM_MEDIA_TYPES.values()
+)
+_MULTIPART_IMAGE_MEDIA_TYPE_VALUES = frozenset(
+    _MULTIPART_IMAGE_MEDIA_TYPES.values()
+)
+_MULTIPART_VIDEO_MEDIA_TYPE_VALUES = frozenset(
+    _MULTIPART_VIDEO_MEDIA_TYPES.values()
+)
+_MULTIPART_RENDERED_VIDEO_MEDIA_TYPES = frozenset({
+    'video/',
+    'video/*',
+    'video/mpeg2',
+    'video/mp4',
+    'video/H265',
+})
+_IMAGE_MEDIA_TYPES = frozenset({
+    'image/',
+    'image/*',
+    'image/jpeg',
+    'image/jp2',
+    'image/gif',
+    'image/png',
+})
+_VIDEO_MEDIA_TYPES = frozenset({
+    'video/',
+    'video/*',
+    'video/mpeg',
+    'video/mp4',
+    'video/H265',
+})
+_TEXT_MEDIA_TYPES = frozenset({
+    'text/',
+    'text/*',
+    'text/html',
+    'text/plain',
+    'text/rtf',
+    'text/xml',
+})
+
+_UID_PATTERN = re.compile(r'^[.0-9]+$')
+
+_UID_NAMES = ('Study Instance UID', 'Series Instance UID', 'SOP Instance UID')
+
+# Searches with a larger limit are split into pages of this size, which are
+# requested concurrently.
+_QIDO_PAGE_SIZE = 500
+
+
+def load_json_dataset(dataset: Dict[str, dict]) -> 'pydicom.dataset.Dataset':
     """Loads DICOM Data Set in DICOM JSON format.
 
     Parameters
@@ -53,10 +181,11 @@ def load_json_dataset(dataset: Dict[str, dict]) -> pydicom.dataset.Dataset:
         'version. Use "pydicom.dataset.Dataset.from_json()" instead.'
     )
     warn(warning_message, category=DeprecationWarning)
+    import pydicom
     return pydicom.dataset.Dataset.from_json(dataset)
 
 
-def _load_xml_dataset(dataset: Element) -> pydicom.dataset.Dataset:
+def _load_xml_dataset(dataset: Element) -> 'pydicom.dataset.Dataset':
     """Loads DICOM Data Set in DICOM XML format.
 
     Parameters
@@ -70,26 +199,80 @@ def _load_xml_dataset(dataset: Element) -> pydicom.dataset.Dataset:
         data set
 
     """
-    ds = pydicom.Dataset()
-    for element in dataset:
-        keyword = element.attrib['keyword']
-        vr = element.attrib['vr']
-        value: Optional[Union[List[Any], str]]
-        if vr == 'SQ':
-            value = [
-                _load_xml_dataset(item)
-                for item in element
-            ]
-        else:
-            value = list(element)
-            if len(value) == 1:
-                value = value[0].text.strip()
-            elif len(value) > 1:
-                value = [v.text.strip() for v in value]
+    import pydicom
+    # Sequence items are loaded from a worklist rather than via recursion,
+    # such that deeply nested sequences don't exhaust the call stack.
+    root = pydicom.Dataset()
+    worklist = [(dataset, root)]
+    while worklist:
+        xml_dataset, ds = worklist.pop()
+        for element in xml_dataset:
+            keyword = element.attrib['keyword']
+            vr = element.attrib['vr']
+            value: Optional[Union[List[Any], str]]
+            if vr == 'SQ':
+                value = [pydicom.Dataset() for _ in element]
+                worklist.extend(zip(element, value))
             else:
-                value = None
-        setattr(ds, keyword, value)
-    return ds
+                value = list(element)
+                if len(value) == 1:
+                    value = value[0].text.strip()
+                elif len(value) > 1:
+                    value = [v.text.strip() for v in value]
+                else:
+                    value = None
+            setattr(ds, keyword, value)
+    return root
+
+
+def _decode_json_content(content: bytes) -> List[Dict[str, dict]]:
+    """Decodes the content of a HTTP message body in DICOM JSON format.
+
+    Parameters
+    ----------
+    content: bytes
+        content of HTTP message body
+
+    Returns
+    -------
+    List[Dict[str, dict]]
+        data sets in DICOM JSON format
+
+    """
+    if not content:
+        return []
+    # DICOM JSON is always UTF-8 encoded (see DICOM Part 18 Section F.2), so
+    # the content can be handed to the faster parser as is.
+    if _HAS_ORJSON:
+        decoded_content = orjson.loads(content)
+    else:
+        decoded_content = json.loads(content)
+    # All metadata resources are expected to be sent as a JSON array of DICOM
+    # data sets. However, some origin servers may incorrectly sent an
+    # individual data set.
+    if isinstance(decoded_content, dict):
+        return [decoded_content]
+    return decoded_content
+
+
+def _encode_dataset(dataset: 'pydicom.dataset.Dataset') -> bytes:
+    """Encodes a DICOM Data Set in DICOM Part 10 format.
+
+    Parameters
+    ----------
+    dataset: pydicom.dataset.Dataset
+        data set
+
+    Returns
+    -------
+    bytes
+        encoded data set
+
+    """
+    import pydicom
+    with BytesIO() as b:
+        pydicom.dcmwrite(b, dataset)
+        return b.getvalue()
 
 
 class DICOMwebClient(object):
@@ -211,7 +394,11 @@ class DICOMwebClient(object):
         proxies: Optional[Dict[str, str]] = None,
         headers: Optional[Dict[str, str]] = None,
         callback: Optional[Callable] = None,
-        chunk_size: int = 10**6
+        chunk_size: int = 10**6,
+        codec_workers: int = 1,
+        pool_maxsize: Optional[int] = None,
+        metadata_cache_size: int = 0,
+        max_concurrency: int = 8
     ) -> None:
         """
         Parameters
@@ -244,6 +431,28 @@ class DICOMwebClient(object):
             when streaming data from the server using chunked transfer encoding
             (used by ``iter_*()`` methods as well as the ``store_instances()``
             method); defaults to ``10**6`` bytes (10MB)
+        codec_workers: int, optional
+            maximum number of threads that should be used for decoding
+            retrieved and encoding stored DICOM data sets; defaults to ``1``,
+            i.e., data sets are decoded and encoded sequentially in the
+            calling thread
+        pool_maxsize: int, optional
+            maximum number of connections per host that should be kept alive
+            for reuse; defaults to ``32`` (or `max_concurrency` if larger) if
+            no `session` is provided and otherwise leaves the connection pool
+            of `session` unchanged; if provided together with a `session`,
+            the transport adapters of the session for HTTP and HTTPS are
+            replaced by a ``requests.adapters.HTTPAdapter`` (keeping the
+            retry configuration of an existing ``HTTPAdapter``), i.e., a
+            custom transport adapter mounted on the session is no longer used
+        metadata_cache_size: int, optional
+            maximum number of metadata resources (study, series or instance
+            metadata) that should be cached in memory; defaults to ``0``,
+            i.e., metadata are requested from the server upon every call
+        max_concurrency: int, optional
+            maximum number of HTTP requests that a single method call should
+            perform concurrently (e.g., for requesting pages of large search
+            results); defaults to ``8``
 
         Warning
         -------
@@ -255,10 +464,25 @@ class DICOMwebClient(object):
         Choose the value of `chunk_size` carefully. A small value may cause
         significant network communication and message parsing overhead.
 
+        Note
+        ----
+        Data sets are decoded in the order in which they are received and
+        returned in the same order, independent of the value of
+        `codec_workers`. Likewise, data sets are stored in the order in which
+        they are provided.
+
+        Note
+        ----
+        Cached metadata are not invalidated when the resources change on
+        the server. Only enable caching via `metadata_cache_size` if resources
+        are not expected to change during the lifetime of the instance.
+
         """  # noqa
         if session is None:
             logger.debug('initialize HTTP session')
             session = requests.session()
+            if pool_maxsize is None:
+                pool_maxsize = max(32, max_concurrency)
         self._session = session
         self.base_url = url
         self.qido_url_prefix = qido_url_prefix
@@ -266,37 +490,51 @@ class DICOMwebClient(object):
         self.stow_url_prefix = stow_url_prefix
         self.delete_url_prefix = delete_url_prefix
 
-        # This regular expression extracts the scheme and host name from the URL
-        # and optionally the port number and prefix:
-        # <scheme>://<host>(:<port>)(/<prefix>)
-        # For example: "https://mydomain.com:443/wado-rs", where
-        # scheme="https", host="mydomain.com", port=443, prefix="wado-rs"
-        pattern = re.compile(
-            r'(?P<scheme>[https]+)://(?P<host>[^/:]+)'
-            r'(?::(?P<port>\d+))?(?:(?P<prefix>/[\w/]+))?'
-        )
-        match = re.match(pattern, self.base_url)
-        if match is None:
-            raise ValueError(f'Malformed URL: {self.base_url}')
+        url_components = urlsplit(self.base_url)
         try:
-            self.protocol = match.group('scheme')
-            self.host = match.group('host')
-            port = match.group('port')
-        except AttributeError:
+            port = url_components.port
+        except ValueError:
+            raise ValueError(f'Malformed URL: {self.base_url}')
+        self.protocol = url_components.scheme
+        host = url_components.hostname
+        if not self.protocol or not host:
             raise ValueError(f'Malformed URL: {self.base_url}')
-        if port:
-            self.port = int(port)
+        self.host = host
+        if self.protocol not in ('http', 'https'):
+            raise ValueError(
+                f'URL scheme "{self.protocol}" is not supported.'
+            )
+        if port is not None:
+            self.port = port
+        elif self.protocol == 'http':
+            self.port = 80
         else:
-            if self.protocol == 'http':
-                self.port = 80
-            elif self.protocol == 'https':
-                self.port = 443
+            self.port = 443
+        self.url_prefix = url_components.path
+        if pool_maxsize is not None:
+            if pool_maxsize < 1:
+                raise ValueError('Parameter "pool_maxsize" must be positive.')
+            # Keep the retry configuration of a passed session, the status
+            # codes are retried separately (see set_http_retry_params()).
+            current_adapter = self._session.get_adapter(self.base_url)
+            max_retries: Union[int, Retry]
+            if isinstance(current_adapter, requests.adapters.HTTPAdapter):
+                max_retries = current_adapter.max_retries
             else:
-                raise ValueError(
-                    f'URL scheme "{self.protocol}" is not supported.'
+                logger.warning(
+                    f'replace transport adapter of type '
+                    f'"{type(current_adapter).__name__}" of the session by '
+                    'a HTTP adapter with a connection pool of size '
+                    f'{pool_maxsize}'
                 )
-        url_components = urlparse(url)
-        self.url_prefix = url_components.path
+                max_retries = requests.adapters.DEFAULT_RETRIES
+            logger.debug(f'use HTTP connection pool of size {pool_maxsize}')
+            adapter = requests.adapters.HTTPAdapter(
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries
+            )
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
         if headers is not None:
             self._session.headers.update(headers)
         if proxies is not None:
@@ -304,8 +542,42 @@ class DICOMwebClient(object):
         if callback is not None:
             self._session.hooks = {'response': [callback, ]}
         self._chunk_size = chunk_size
+        if codec_workers < 1:
+            raise ValueError('Parameter "codec_workers" must be positive.')
+        self._codec_workers = codec_workers
+        self._codec_executor: Optional[ThreadPoolExecutor] = None
+        self._codec_executor_lock = threading.Lock()
+        if max_concurrency < 1:
+            raise ValueError('Parameter "max_concurrency" must be positive.')
+        self._max_concurrency = max_concurrency
+        if metadata_cache_size < 0:
+            raise ValueError(
+                'Parameter "metadata_cache_size" must not be negative.'
+            )
+        # Response message bodies by URL in least recently used order. The
+        # bodies are decoded upon each hit, which is faster than copying the
+        # decoded data sets and gives each caller its own copy.
+        self._metadata_cache_size = metadata_cache_size
+        self._metadata_cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._metadata_cache_lock = threading.Lock()
         self.set_http_retry_params()
 
+    def close(self) -> None:
+        """Shuts down the pool of threads that is used for decoding and
+        encoding data sets (see `codec_workers`), if it has been created.
+
+        Note
+        ----
+        Waits for pending data sets to be decoded or encoded. The pool is
+        created again if the client is used after it has been closed.
+
+        """
+        with self._codec_executor_lock:
+            executor = self._codec_executor
+            self._codec_executor = None
+        if executor is not None:
+            executor.shutdown()
+
     def _parse_qido_query_parameters(
         self,
         fuzzymatching: Optional[bool] = None,
@@ -334,7 +606,7 @@ class DICOMwebClient(object):
 
         Returns
         -------
-        collections.OrderedDict
+        Dict[str, Any]
             sanitized and sorted query parameters
 
         """
@@ -359,12 +631,11 @@ class DICOMwebClient(object):
             else:
                 params['fuzzymatching'] = 'false'
         if fields is not None:
-            includefields = []
-            for field in set(fields):
+            for field in fields:
                 if not(isinstance(field, str)):
                     raise TypeError('Elements of "fields" must be a string.')
-                includefields.append(field)
-            params['includefield'] = includefields
+            # Each field is included only once, in the order it was requested.
+            params['includefield'] = list(dict.fromkeys(fields))
         if search_filters is not None:
             for field, criterion in search_filters.items():
                 if not(isinstance(field, str)):
@@ -374,7 +645,7 @@ class DICOMwebClient(object):
                 # TODO: datetime?
                 params[field] = criterion
         # Sort query parameters to facilitate unit testing
-        return OrderedDict(sorted(params.items()))
+        return dict(sorted(params.items()))
 
     def _get_service_url(self, service_name: str) -> str:
         """Constructes the URL of a DICOMweb RESTful service.
@@ -431,14 +702,10 @@ class DICOMwebClient(object):
             URL
 
         """
-        if study_instance_uid is not None:
-            url = '{service_url}/studies/{study_instance_uid}'
-        else:
-            url = '{service_url}/studies'
         service_url = self._get_service_url(service_name)
-        return url.format(
-            service_url=service_url, study_instance_uid=study_instance_uid
-        )
+        if study_instance_uid is not None:
+            return f'{service_url}/studies/{study_instance_uid}'
+        return f'{service_url}/studies'
 
     def _get_series_url(
         self,
@@ -467,19 +734,14 @@ class DICOMwebClient(object):
         if study_instance_uid is not None:
             url = self._get_studies_url(service_name, study_instance_uid)
             if series_instance_uid is not None:
-                url += '/series/{series_instance_uid}'
-            else:
-                url += '/series'
-        else:
-            if series_instance_uid is not None:
-                logger.warning(
-                    'series UID is ignored because study UID is undefined'
-                )
-            url = '{service_url}/series'
+                return f'{url}/series/{series_instance_uid}'
+            return f'{url}/series'
+        if series_instance_uid is not None:
+            logger.warning(
+                'series UID is ignored because study UID is undefined'
+            )
         service_url = self._get_service_url(service_name)
-        return url.format(
-            service_url=service_url, series_instance_uid=series_instance_uid
-        )
+        return f'{service_url}/series'
 
     def _get_instances_url(
         self,
@@ -514,20 +776,16 @@ class DICOMwebClient(object):
                 study_instance_uid,
                 series_instance_uid
             )
-            url += '/instances'
             if sop_instance_uid is not None:
-                url += '/{sop_instance_uid}'
-        else:
-            if sop_instance_uid is not None:
-                logger.warning(
-                    'SOP Instance UID is ignored because Study/Series '
-                    'Instance UID are undefined'
-                )
-            url = '{service_url}/instances'
+                return f'{url}/instances/{sop_instance_uid}'
+            return f'{url}/instances'
+        if sop_instance_uid is not None:
+            logger.warning(
+                'SOP Instance UID is ignored because Study/Series '
+                'Instance UID are undefined'
+            )
         service_url = self._get_service_url(service_name)
-        return url.format(
-            service_url=service_url, sop_instance_uid=sop_instance_uid
-        )
+        return f'{service_url}/instances'
 
     def _build_query_string(self, params: Dict[str, Any]) -> str:
         """Builds a HTTP query string for a GET request message.
@@ -625,6 +883,40 @@ class DICOMwebClient(object):
             logger.warning(response.headers['Warning'])
         return response
 
+    def _http_get_application_json_content(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> bytes:
+        """Performs a HTTP GET request that accepts "applicaton/dicom+json"
+        or "application/json" media type without decoding the message body.
+
+        Parameters
+        ----------
+        url: str
+            unique resource locator
+        params: Dict[str], optional
+            query parameters
+        stream: bool, optional
+            whether data should be streamed (i.e., requested using chunked
+            transfer encoding)
+
+        Returns
+        -------
+        bytes
+            content of HTTP message body
+
+        """
+        content_type = 'application/dicom+json, application/json'
+        response = self._http_get(
+            url,
+            params=params,
+            headers={'Accept': content_type},
+            stream=stream
+        )
+        return response.content
+
     def _http_get_application_json(
         self,
         url: str,
@@ -650,32 +942,148 @@ class DICOMwebClient(object):
             content of HTTP message body in DICOM JSON format
 
         """
-        content_type = 'application/dicom+json, application/json'
-        response = self._http_get(
+        content = self._http_get_application_json_content(
             url,
             params=params,
-            headers={'Accept': content_type},
             stream=stream
         )
-        if response.content:
-            decoded_response = response.json()
-            # All metadata resources are expected to be sent as a JSON array of
-            # DICOM data sets. However, some origin servers may incorrectly
-            # sent an individual data set.
-            if isinstance(decoded_response, dict):
-                return [decoded_response]
-            return decoded_response
-        return []
+        return _decode_json_content(content)
+
+    def _http_get_metadata(self, url: str) -> List[Dict[str, dict]]:
+        """Performs a HTTP GET request for a metadata resource.
+
+        Parameters
+        ----------
+        url: str
+            unique resource locator
+
+        Returns
+        -------
+        List[Dict[str, dict]]
+            metadata in DICOM JSON format
+
+        Note
+        ----
+        If caching of metadata is enabled, the cached message body is decoded
+        upon each call, such that callers can't modify the cache.
+
+        """
+        if self._metadata_cache_size == 0:
+            return self._http_get_application_json(url)
+        with self._metadata_cache_lock:
+            content = self._metadata_cache.get(url)
+            if content is not None:
+                self._metadata_cache.move_to_end(url)
+        if content is None:
+            content = self._http_get_application_json_content(url)
+            with self._metadata_cache_lock:
+                self._metadata_cache[url] = content
+                self._metadata_cache.move_to_end(url)
+                if len(self._metadata_cache) > self._metadata_cache_size:
+                    self._metadata_cache.popitem(last=False)
+        return _decode_json_content(content)
+
+    def _search(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        page_size: int = _QIDO_PAGE_SIZE
+    ) -> List[Dict[str, dict]]:
+        """Performs a QIDO-RS search.
+
+        Parameters
+        ----------
+        url: str
+            unique resource locator
+        params: Dict[str, Any]
+            sanitized query parameters
+        page_size: int, optional
+            maximum number of results that should be requested at once
+
+        Returns
+        -------
+        List[Dict[str, dict]]
+            search results in DICOM JSON format
+
+        Note
+        ----
+        If the `limit` query parameter exceeds `page_size`, results are
+        requested in pages with consecutive offsets. The first page is
+        requested on its own and only if it is full, the following pages are
+        requested concurrently (at most `max_concurrency` at a time).
+        Paging stops at the first page that has fewer results than requested
+        (no more matches) or more results than requested (the server doesn't
+        respect the `limit` or `offset` query parameters). At most `limit`
+        results are returned.
+
+        """
+        limit = params.get('limit')
+        if limit is None or limit <= page_size:
+            return self._http_get_application_json(url, params)
+        offset = params.get('offset', 0)
+        end = offset + limit
+
+        def get_page(page_offset: int) -> List[Dict[str, dict]]:
+            page_params = dict(params)
+            page_params['limit'] = min(page_size, end - page_offset)
+            page_params['offset'] = page_offset
+            return self._http_get_application_json(url, page_params)
+
+        results = get_page(offset)
+        if len(results) != page_size:
+            return results[:limit]
+        page_offsets = iter(range(offset + page_size, end, page_size))
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            pending: Deque[Tuple[int, Future]] = deque()
+
+            def submit_next_page() -> None:
+                page_offset = next(page_offsets, None)
+                if page_offset is not None:
+                    future = executor.submit(get_page, page_offset)
+                    pending.append((page_offset, future))
+
+            for _ in range(self._max_concurrency):
+                submit_next_page()
+            try:
+                while pending:
+                    page_offset, future = pending.popleft()
+                    page = future.result()
+                    page_limit = min(page_size, end - page_offset)
+                    if len(page) > page_limit:
+                        # The page doesn't start at the requested offset and
+                        # would duplicate results of previous pages.
+                        break
+                    results.extend(page)
+                    # The server may return fewer results than requested,
+                    # either because there are no more matches or because it
+                    # limits the number of results per response.
+                    if len(page) < page_limit:
+                        break
+                    submit_next_page()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+        return results
 
     @classmethod
-    def _extract_part_content(cls, part: bytes) -> Union[bytes, None]:
+    def _extract_part_content(
+        cls,
+        data: Union[bytes, bytearray],
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Union[bytes, None]:
         """Extracts the content of a single part of a multipart message
         by stripping the headers.
 
         Parameters
         ----------
-        part: bytes
-            an individual part of a multipart message
+        data: Union[bytes, bytearray]
+            buffer that contains an individual part of a multipart message
+        start: int, optional
+            index of the first byte of the part in `data`
+        end: int, optional
+            index after the last byte of the part in `data`
+            (defaults to the length of `data`)
 
         Returns
         -------
@@ -688,12 +1096,27 @@ class DICOMwebClient(object):
         ValueError
             when the message part is not CRLF CRLF terminated
 
+        Note
+        ----
+        The part is located within `data` in place, such that only the content
+        itself gets copied.
+
         """
-        if part in (b'', b'--', b'\r\n') or part.startswith(b'--\r\n'):
+        if end is None:
+            end = len(data)
+        if end - start <= 2 and data[start:end] in (b'', b'--', b'\r\n'):
+            return None
+        if data.startswith(b'--\r\n', start, end):
             return None
-        if b'\r\n\r\n' in part:
-            return part.split(b'\r\n\r\n')[1]
-        raise ValueError('Message part does not contain CRLF CRLF')
+        # Only the first CRLF CRLF terminates the headers. The content may
+        # contain the same byte sequence and must be returned unaltered.
+        index = data.find(b'\r\n\r\n', start, end)
+        if index == -1:
+            raise ValueError('Message part does not contain CRLF CRLF')
+        if isinstance(data, bytearray):
+            with memoryview(data) as view:
+                return bytes(view[index + 4:end])
+        return data[index + 4:end]
 
     def _decode_multipart_message(
         self,
@@ -715,6 +1138,12 @@ class DICOMwebClient(object):
         Iterator[bytes]
             message parts
 
+        Note
+        ----
+        The ``retrieve_*()`` methods stream multipart messages as well and
+        collect the parts as they are received, such that the entire message
+        body is never loaded into memory at once.
+
         """
         logger.debug('decode multipart message')
         logger.debug('decode message header')
@@ -738,7 +1167,9 @@ class DICOMwebClient(object):
 
         marker = b''.join((b'--', boundary))
         delimiter = b''.join((b'\r\n', marker))
-        data = b''
+        # When data is streamed, chunks are accumulated in a mutable buffer,
+        # which can be extended and truncated without copying its content.
+        data: Union[bytes, bytearray] = bytearray() if stream else b''
         with response:
             logger.debug('decode message content')
             if stream:
@@ -748,24 +1179,91 @@ class DICOMwebClient(object):
             for i, chunk in enumerate(iterator):
                 if stream:
                     logger.debug(f'decode message content chunk #{i}')
-                data += chunk
-                while delimiter in data:
-                    part, data = data.split(delimiter, maxsplit=1)
-                    content = self._extract_part_content(part)
+                # Bytes that have already been searched don't contain the
+                # delimiter, apart from possibly its beginning at the very end.
+                search_start = max(len(data) - len(delimiter) + 1, 0)
+                if stream:
+                    data += chunk
+                else:
+                    data = chunk
+                part_start = 0
+                while True:
+                    part_end = data.find(delimiter, search_start)
+                    if part_end == -1:
+                        break
+                    content = self._extract_part_content(
+                        data, part_start, part_end
+                    )
                     if content is not None:
                         yield content
+                    part_start = part_end + len(delimiter)
+                    search_start = part_start
+                if part_start > 0:
+                    if isinstance(data, bytearray):
+                        del data[:part_start]
+                    else:
+                        data = data[part_start:]
 
         content = self._extract_part_content(data)
         if content is not None:
             yield content
 
+    def _map_parts(
+        self,
+        parts: Iterable[Any],
+        func: Callable[[Any], Any]
+    ) -> Iterator[Any]:
+        """Decodes or encodes message parts, optionally using a pool of
+        threads.
+
+        Parameters
+        ----------
+        parts: Iterable[Any]
+            message parts (or data sets that should be encoded as such)
+        func: Callable[[Any], Any]
+            function that decodes or encodes an individual message part
+
+        Returns
+        -------
+        Iterator[Any]
+            decoded or encoded message parts in the order of `parts`
+
+        Note
+        ----
+        At most twice the number of `codec_workers` message parts are
+        processed ahead of the part that is yielded next, such that streamed
+        message parts are not all held in memory at once.
+
+        """
+        if self._codec_workers == 1:
+            for part in parts:
+                yield func(part)
+            return
+        with self._codec_executor_lock:
+            if self._codec_executor is None:
+                logger.debug(
+                    f'initialize pool of {self._codec_workers} codec threads'
+                )
+                self._codec_executor = ThreadPoolExecutor(
+                    max_workers=self._codec_workers
+                )
+            executor = self._codec_executor
+        pending: deque = deque()
+        for part in parts:
+            pending.append(executor.submit(func, part))
+            if len(pending) >= 2 * self._codec_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
     @classmethod
-    def _encode_multipart_message(
+    def _encode_multipart_message_parts(
         cls,
         content: Sequence[bytes],
         content_type: str
-    ) -> bytes:
-        """Encodes the payload of a HTTP multipart response message.
+    ) -> List[bytes]:
+        """Encodes the payload of a HTTP multipart request message as a
+        sequence of byte chunks.
 
         Parameters
         ----------
@@ -776,8 +1274,15 @@ class DICOMwebClient(object):
 
         Returns
         -------
-        bytes
-            HTTP request message body
+        List[bytes]
+            chunks of the HTTP request message body, which need to be
+            transferred in order
+
+        Note
+        ----
+        The content of each part is included as is rather than copied into
+        a single buffer, such that the message body can be transferred
+        without holding a second copy of all parts in memory.
 
         """
         media_type, *ct_info = [ct.strip() for ct in content_type.split(';')]
@@ -801,13 +1306,41 @@ class DICOMwebClient(object):
             raise ValueError(
                 'No "boundary" parameter in found in content-type field'
             )
-        body = b''
+        part_header = (
+            f'\r\n--{boundary}'
+            f'\r\nContent-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        chunks = []
         for part in content:
-            body += f'\r\n--{boundary}'.encode('utf-8')
-            body += f'\r\nContent-Type: {content_type}\r\n\r\n'.encode('utf-8')
-            body += part
-        body += f'\r\n--{boundary}--'.encode('utf-8')
-        return body
+            chunks.append(part_header)
+            chunks.append(part)
+        chunks.append(f'\r\n--{boundary}--'.encode('utf-8'))
+        return chunks
+
+    @classmethod
+    def _encode_multipart_message(
+        cls,
+        content: Sequence[bytes],
+        content_type: str
+    ) -> bytes:
+        """Encodes the payload of a HTTP multipart request message.
+
+        Parameters
+        ----------
+        content: Sequence[bytes]
+            content of each part
+        content_type: str
+            content type of the multipart HTTP request message
+
+        Returns
+        -------
+        bytes
+            HTTP request message body
+
+        """
+        return b''.join(
+            cls._encode_multipart_message_parts(content, content_type)
+        )
 
     @classmethod
     def _assert_media_type_is_valid(cls, media_type: str):
@@ -867,7 +1400,7 @@ class DICOMwebClient(object):
     def _build_accept_header_field_value(
         cls,
         media_types: Union[Tuple[Union[str, Tuple[str, str]]], None],
-        supported_media_types: Set[str]
+        supported_media_types: FrozenSet[str]
     ) -> str:
         """Builds an accept header field value for HTTP GET request messages.
 
@@ -875,7 +1408,7 @@ class DICOMwebClient(object):
         ----------
         media_types: Union[Tuple[str], None]
             acceptable media types
-        supported_media_types: Set[str]
+        supported_media_types: FrozenSet[str]
             supported media types
 
         Returns
@@ -908,7 +1441,8 @@ class DICOMwebClient(object):
     def _build_multipart_accept_header_field_value(
         cls,
         media_types: Union[Tuple[Union[str, Tuple[str, str]]], None],
-        supported_media_types: Union[Dict[str, str], Set[str]]
+        supported_media_types: FrozenSet[str],
+        supported_transfer_syntaxes: Optional[Dict[str, str]] = None
     ) -> str:
         """Builds an accept header field value for HTTP GET multipart request
         messages.
@@ -918,9 +1452,12 @@ class DICOMwebClient(object):
         media_types: Union[Tuple[Union[str, Tuple[str, str]]], None]
             acceptable media types and optionally the UIDs of the corresponding
             transfer syntaxes
-        supported_media_types: Union[Dict[str, str], Set[str]]
-            set of supported media types or mapping of transfer syntaxes
-            to their corresponding media types
+        supported_media_types: FrozenSet[str]
+            supported media types
+        supported_transfer_syntaxes: Dict[str, str], optional
+            mapping of supported transfer syntaxes to their corresponding
+            media types (if provided, transfer syntaxes of acceptable media
+            types are checked and wildcard media types are accepted)
 
         Returns
         -------
@@ -945,8 +1482,8 @@ class DICOMwebClient(object):
                     transfer_syntax_uid = None
             cls._assert_media_type_is_valid(media_type)
             field_value = f'multipart/related; type="{media_type}"'
-            if isinstance(supported_media_types, dict):
-                if media_type not in supported_media_types.values():
+            if supported_transfer_syntaxes is not None:
+                if media_type not in supported_media_types:
                     if not (media_type.endswith('/*') or
                             media_type.endswith('/')):
                         raise ValueError(
@@ -955,12 +1492,13 @@ class DICOMwebClient(object):
                         )
                 if transfer_syntax_uid is not None:
                     if transfer_syntax_uid != '*':
-                        if transfer_syntax_uid not in supported_media_types:
+                        if (transfer_syntax_uid not in
+                                supported_transfer_syntaxes):
                             raise ValueError(
                                 f'Transfer syntax "{transfer_syntax_uid}" '
                                 'is not supported for requested resource.'
                             )
-                        expected_media_type = supported_media_types[
+                        expected_media_type = supported_transfer_syntaxes[
                             transfer_syntax_uid
                         ]
                         if expected_media_type != media_type:
@@ -993,7 +1531,7 @@ class DICOMwebClient(object):
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
         params: Optional[Dict[str, Any]] = None,
         stream: bool = False
-    ) -> Iterator[pydicom.dataset.Dataset]:
+    ) -> Iterator['pydicom.dataset.Dataset']:
         """Performs a HTTP GET request that accepts a multipart message with
         "applicaton/dicom" media type.
 
@@ -1017,33 +1555,14 @@ class DICOMwebClient(object):
             DICOM data sets
 
         """
-        default_media_type = 'application/dicom'
-        supported_media_types = {
-            '1.2.840.10008.1.2.1': default_media_type,
-            '1.2.840.10008.1.2.5': default_media_type,
-            '1.2.840.10008.1.2.4.50': default_media_type,
-            '1.2.840.10008.1.2.4.51': default_media_type,
-            '1.2.840.10008.1.2.4.57': default_media_type,
-            '1.2.840.10008.1.2.4.70': default_media_type,
-            '1.2.840.10008.1.2.4.80': default_media_type,
-            '1.2.840.10008.1.2.4.81': default_media_type,
-            '1.2.840.10008.1.2.4.90': default_media_type,
-            '1.2.840.10008.1.2.4.91': default_media_type,
-            '1.2.840.10008.1.2.4.92': default_media_type,
-            '1.2.840.10008.1.2.4.93': default_media_type,
-            '1.2.840.10008.1.2.4.100': default_media_type,
-            '1.2.840.10008.1.2.4.101': default_media_type,
-            '1.2.840.10008.1.2.4.102': default_media_type,
-            '1.2.840.10008.1.2.4.103': default_media_type,
-            '1.2.840.10008.1.2.4.104': default_media_type,
-            '1.2.840.10008.1.2.4.105': default_media_type,
-            '1.2.840.10008.1.2.4.106': default_media_type,
-        }
+        import pydicom
         if media_types is None:
-            media_types = (default_media_type, )
+            media_types = ('application/dicom', )
         headers = {
             'Accept': self._build_multipart_accept_header_field_value(
-                media_types, supported_media_types
+                media_types,
+                _MULTIPART_APPLICATION_DICOM_MEDIA_TYPE_VALUES,
+                _MULTIPART_APPLICATION_DICOM_MEDIA_TYPES
             ),
         }
         response = self._http_get(
@@ -1052,9 +1571,9 @@ class DICOMwebClient(object):
             headers=headers,
             stream=stream
         )
-        return (
-            pydicom.dcmread(BytesIO(part))
-            for part in self._decode_multipart_message(response, stream=stream)
+        return self._map_parts(
+            self._decode_multipart_message(response, stream=stream),
+            lambda part: pydicom.dcmread(BytesIO(part))
         )
 
     def _http_get_multipart_application_octet_stream(
@@ -1090,16 +1609,13 @@ class DICOMwebClient(object):
             content of HTTP message body parts
 
         """
-        default_media_type = 'application/octet-stream'
-        supported_media_types = {
-            '1.2.840.10008.1.2.1': default_media_type,
-        }
         if media_types is None:
-            media_types = (default_media_type, )
+            media_types = ('application/octet-stream', )
         headers = {
             'Accept': self._build_multipart_accept_header_field_value(
                 media_types,
-                supported_media_types
+                _MULTIPART_APPLICATION_OCTET_STREAM_MEDIA_TYPE_VALUES,
+                _MULTIPART_APPLICATION_OCTET_STREAM_MEDIA_TYPES
             ),
         }
         if byte_range is not None:
@@ -1148,35 +1664,20 @@ class DICOMwebClient(object):
 
         """
         headers = {}
-        supported_media_types: Union[set, dict]
+        supported_transfer_syntaxes: Optional[Dict[str, str]] = None
         if rendered:
-            supported_media_types = {
-                'image/jpeg',
-                'image/gif',
-                'image/png',
-                'image/jp2',
-            }
+            supported_media_types = _MULTIPART_RENDERED_IMAGE_MEDIA_TYPES
         else:
-            supported_media_types = {
-                '1.2.840.10008.1.2.5': 'image/x-dicom-rle',
-                '1.2.840.10008.1.2.4.50': 'image/jpeg',
-                '1.2.840.10008.1.2.4.51': 'image/jpeg',
-                '1.2.840.10008.1.2.4.57': 'image/jpeg',
-                '1.2.840.10008.1.2.4.70': 'image/jpeg',
-                '1.2.840.10008.1.2.4.80': 'image/x-jls',
-                '1.2.840.10008.1.2.4.81': 'image/x-jls',
-                '1.2.840.10008.1.2.4.90': 'image/jp2',
-                '1.2.840.10008.1.2.4.91': 'image/jp2',
-                '1.2.840.10008.1.2.4.92': 'image/jpx',
-                '1.2.840.10008.1.2.4.93': 'image/jpx',
-            }
+            supported_media_types = _MULTIPART_IMAGE_MEDIA_TYPE_VALUES
+            supported_transfer_syntaxes = _MULTIPART_IMAGE_MEDIA_TYPES
             if byte_range is not None:
                 headers['Range'] = self._build_range_header_field_value(
                     byte_range
                 )
         headers['Accept'] = self._build_multipart_accept_header_field_value(
             media_types,
-            supported_media_types
+            supported_media_types,
+            supported_transfer_syntaxes
         )
         response = self._http_get(
             url,
@@ -1222,32 +1723,20 @@ class DICOMwebClient(object):
 
         """
         headers = {}
-        supported_media_types: Union[set, dict]
+        supported_transfer_syntaxes: Optional[Dict[str, str]] = None
         if rendered:
-            supported_media_types = {
-                'video/',
-                'video/*',
-                'video/mpeg2',
-                'video/mp4',
-                'video/H265',
-            }
+            supported_media_types = _MULTIPART_RENDERED_VIDEO_MEDIA_TYPES
         else:
-            supported_media_types = {
-                '1.2.840.10008.1.2.4.100': 'video/mpeg2',
-                '1.2.840.10008.1.2.4.101': 'video/mpeg2',
-                '1.2.840.10008.1.2.4.102': 'video/mp4',
-                '1.2.840.10008.1.2.4.103': 'video/mp4',
-                '1.2.840.10008.1.2.4.104': 'video/mp4',
-                '1.2.840.10008.1.2.4.105': 'video/mp4',
-                '1.2.840.10008.1.2.4.106': 'video/mp4',
-            }
+            supported_media_types = _MULTIPART_VIDEO_MEDIA_TYPE_VALUES
+            supported_transfer_syntaxes = _MULTIPART_VIDEO_MEDIA_TYPES
             if byte_range is not None:
                 headers['Range'] = self._build_range_header_field_value(
                     byte_range
                 )
         headers['Accept'] = self._build_multipart_accept_header_field_value(
             media_types,
-            supported_media_types
+            supported_media_types,
+            supported_transfer_syntaxes
         )
         response = self._http_get(
             url,
@@ -1321,17 +1810,9 @@ class DICOMwebClient(object):
             content of HTTP message body
 
         """
-        supported_media_types = {
-            'image/',
-            'image/*',
-            'image/jpeg',
-            'image/jp2',
-            'image/gif',
-            'image/png',
-        }
         accept_header_field_value = self._build_accept_header_field_value(
             media_types,
-            supported_media_types
+            _IMAGE_MEDIA_TYPES
         )
         response = self._http_get(
             url,
@@ -1370,16 +1851,9 @@ class DICOMwebClient(object):
             content of HTTP message body
 
         """
-        supported_media_types = {
-            'video/',
-            'video/*',
-            'video/mpeg',
-            'video/mp4',
-            'video/H265',
-        }
         accept_header_field_value = self._build_accept_header_field_value(
             media_types,
-            supported_media_types
+            _VIDEO_MEDIA_TYPES
         )
         response = self._http_get(
             url,
@@ -1418,16 +1892,8 @@ class DICOMwebClient(object):
             content of HTTP message body
 
         """
-        supported_media_types = {
-            'text/',
-            'text/*',
-            'text/html',
-            'text/plain',
-            'text/rtf',
-            'text/xml',
-        }
         accept_header_field_value = self._build_accept_header_field_value(
-            media_types, supported_media_types
+            media_types, _TEXT_MEDIA_TYPES
         )
         response = self._http_get(
             url,
@@ -1440,7 +1906,7 @@ class DICOMwebClient(object):
     def _http_post(
             self,
             url: str,
-            data: bytes,
+            data: Union[bytes, Sequence[bytes]],
             headers: Dict[str, str]
         ) -> requests.models.Response:
         """Performs a HTTP POST request.
@@ -1449,8 +1915,9 @@ class DICOMwebClient(object):
         ----------
         url: str
             unique resource locator
-        data: bytes
-            HTTP request message payload
+        data: Union[bytes, Sequence[bytes]]
+            HTTP request message payload, either as a single buffer or as a
+            sequence of chunks that are transferred in order
         headers: Dict[str, str]
             HTTP request message headers
 
@@ -1460,11 +1927,20 @@ class DICOMwebClient(object):
             HTTP response message
 
         """
+        if isinstance(data, bytes):
+            data = [data]
+
         def serve_data_chunks(data):
-            for i, offset in enumerate(range(0, len(data), self._chunk_size)):
-                logger.debug(f'serve data chunk #{i}')
-                end = offset + self._chunk_size
-                yield data[offset:end]
+            i = 0
+            for item in data:
+                for offset in range(0, len(item), self._chunk_size):
+                    logger.debug(f'serve data chunk #{i}')
+                    end = offset + self._chunk_size
+                    if offset == 0 and end >= len(item):
+                        yield item
+                    else:
+                        yield item[offset:end]
+                    i += 1
 
         @retrying.retry(
             retry_on_result=self._is_retriable_http_error,
@@ -1473,20 +1949,26 @@ class DICOMwebClient(object):
         )
         def _invoke_post_request(
                 url: str,
-                data: bytes,
-                headers: Optional[Dict[str, str]] = None
+                data: Union[bytes, Sequence[bytes]],
+                headers: Optional[Dict[str, str]] = None,
+                chunked: bool = False
             ) -> requests.models.Response:
             logger.debug(f'POST: {url} {headers}')
+            # The generator must be created for each attempt, because it is
+            # exhausted once the request message has been sent.
+            if chunked:
+                data = serve_data_chunks(data)
             return self._session.post(url, data=data, headers=headers)
 
-        if len(data) > self._chunk_size:
+        if sum(len(item) for item in data) > self._chunk_size:
             logger.info('store data in chunks using chunked transfer encoding')
             chunked_headers = dict(headers)
             chunked_headers['Transfer-Encoding'] = 'chunked'
             chunked_headers['Cache-Control'] = 'no-cache'
             chunked_headers['Connection'] = 'Keep-Alive'
-            data_chunks = serve_data_chunks(data)
-            response = _invoke_post_request(url, data_chunks, chunked_headers)
+            response = _invoke_post_request(
+                url, data, chunked_headers, chunked=True
+            )
         else:
             # There is a bug in the requests library that sets the Host header
             # again when using chunked transer encoding. Apparently this is
@@ -1494,7 +1976,7 @@ class DICOMwebClient(object):
             # As a temporary workaround we are only setting the header field,
             # if we don't use chunked transfer encoding.
             headers['Host'] = self.host
-            response = _invoke_post_request(url, data, headers)
+            response = _invoke_post_request(url, b''.join(data), headers)
         logger.debug(f'request status code: {response.status_code}')
         response.raise_for_status()
         if not response.ok:
@@ -1522,7 +2004,7 @@ class DICOMwebClient(object):
             self,
             url: str,
             data: Sequence[bytes]
-        ) -> pydicom.Dataset:
+        ) -> 'pydicom.Dataset':
         """Performs a HTTP POST request with a multipart payload with
         "application/dicom" media type.
 
@@ -1539,12 +2021,13 @@ class DICOMwebClient(object):
             information about stored instances
 
         """
+        import pydicom
         content_type = (
             'multipart/related; '
             'type="application/dicom"; '
             'boundary="0f3cf5c0-70e0-41ef-baef-c6f9f65ec3e1"'
         )
-        content = self._encode_multipart_message(data, content_type)
+        content = self._encode_multipart_message_parts(data, content_type)
         response = self._http_post(
             url,
             content,
@@ -1624,14 +2107,15 @@ class DICOMwebClient(object):
         The server may only return a subset of search results. In this case,
         a warning will notify the client that there are remaining results.
         Remaining results can be requested via repeated calls using the
-        `offset` parameter.
+        `offset` parameter. Large values of `limit` are requested in pages
+        of 500 results via concurrent requests.
 
         """ # noqa
         url = self._get_studies_url('qido')
         params = self._parse_qido_query_parameters(
             fuzzymatching, limit, offset, fields, search_filters
         )
-        return self._http_get_application_json(url, params)
+        return self._search(url, params)
 
     @classmethod
     def _parse_media_type(cls, media_type: str) -> Tuple[str, str]:
@@ -1703,11 +2187,12 @@ class DICOMwebClient(object):
             else:
                 mtype, msubtype = cls._parse_media_type(media_type)
                 common_media_types.append(f'{mtype}/')
-        if len(set(common_media_types)) == 0:
+        unique_media_types = set(common_media_types)
+        if len(unique_media_types) == 0:
             raise ValueError(
                 'No common acceptable media type could be identified.'
             )
-        elif len(set(common_media_types)) > 1:
+        elif len(unique_media_types) > 1:
             raise ValueError('Acceptable media types must have the same type.')
         return common_media_types[0]
 
@@ -1791,7 +2276,7 @@ class DICOMwebClient(object):
                 url=url,
                 media_types=media_types,
                 byte_range=byte_range,
-                stream=False
+                stream=True
             )
         )
 
@@ -1835,7 +2320,7 @@ class DICOMwebClient(object):
         study_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
         stream: bool = False
-    ) -> Iterator[pydicom.dataset.Dataset]:
+    ) -> Iterator['pydicom.dataset.Dataset']:
         """Gets instances of a given DICOM study.
 
         Parameters
@@ -1855,10 +2340,10 @@ class DICOMwebClient(object):
             data sets
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of study.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of study',
+            study_instance_uid
+        )
         url = self._get_studies_url('wado', study_instance_uid)
         if media_types is None:
             return self._http_get_multipart_application_dicom(
@@ -1881,7 +2366,7 @@ class DICOMwebClient(object):
         self,
         study_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
-    ) -> List[pydicom.dataset.Dataset]:
+    ) -> List['pydicom.dataset.Dataset']:
         """Retrieves instances of a given DICOM study.
 
         Parameters
@@ -1902,7 +2387,7 @@ class DICOMwebClient(object):
             self._get_study(
                 study_instance_uid=study_instance_uid,
                 media_types=media_types,
-                stream=False
+                stream=True
             )
         )
 
@@ -1910,7 +2395,7 @@ class DICOMwebClient(object):
         self,
         study_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
-    ) -> Iterator[pydicom.dataset.Dataset]:
+    ) -> Iterator['pydicom.dataset.Dataset']:
         """Iterates over instances of a given DICOM study.
 
         Parameters
@@ -1954,14 +2439,13 @@ class DICOMwebClient(object):
             metadata in DICOM JSON format
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'study metadata.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of study metadata',
+            study_instance_uid
+        )
         url = self._get_studies_url('wado', study_instance_uid)
         url += '/metadata'
-        return self._http_get_application_json(url)
+        return self._http_get_metadata(url)
 
     def delete_study(self, study_instance_uid: str) -> None:
         """Deletes specified study and its respective instances.
@@ -1986,10 +2470,10 @@ class DICOMwebClient(object):
         This method performs a DELETE and should be used with caution.
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-              'Study Instance UID is required for deletion of a study.'
-            )
+        self._assert_uids_are_provided(
+            'deletion of a study',
+            study_instance_uid
+        )
         url = self._get_studies_url('delete', study_instance_uid)
         return self._http_delete(url)
 
@@ -2012,10 +2496,42 @@ class DICOMwebClient(object):
         """
         if not isinstance(uid, str):
             raise TypeError('DICOM UID must be a string.')
-        pattern = re.compile('^[.0-9]+$')
-        if not pattern.search(uid):
+        if not _UID_PATTERN.search(uid):
             raise ValueError('DICOM UID has invalid format.')
 
+    def _assert_uids_are_provided(
+        self,
+        purpose: str,
+        *uids: Optional[str],
+        validate: bool = False
+    ) -> None:
+        """Checks whether the DICOM UIDs required for a request are provided.
+
+        Parameters
+        ----------
+        purpose: str
+            purpose of the request (e.g., ``"retrieval of series"``)
+        *uids: Union[str, None]
+            Study Instance UID, Series Instance UID and SOP Instance UID, in
+            this order, as far as required for the request
+        validate: bool, optional
+            whether the format of the UIDs should be checked as well
+
+        Raises
+        ------
+        TypeError
+            when `validate` is ``True`` and a UID is not a string
+        ValueError
+            when a UID is ``None`` or when `validate` is ``True`` and a UID
+            has an invalid format
+
+        """
+        for name, uid in zip(_UID_NAMES, uids):
+            if uid is None:
+                raise ValueError(f'{name} is required for {purpose}.')
+            if validate:
+                self._assert_uid_format(uid)
+
     def search_for_series(
         self,
         study_instance_uid: Optional[str] = None,
@@ -2055,7 +2571,8 @@ class DICOMwebClient(object):
         The server may only return a subset of search results. In this case,
         a warning will notify the client that there are remaining results.
         Remaining results can be requested via repeated calls using the
-        `offset` parameter.
+        `offset` parameter. Large values of `limit` are requested in pages
+        of 500 results via concurrent requests.
 
         """ # noqa
         if study_instance_uid is not None:
@@ -2064,7 +2581,7 @@ class DICOMwebClient(object):
         params = self._parse_qido_query_parameters(
             fuzzymatching, limit, offset, fields, search_filters
         )
-        return self._http_get_application_json(url, params)
+        return self._search(url, params)
 
     def _get_series(
         self,
@@ -2072,7 +2589,7 @@ class DICOMwebClient(object):
         series_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
         stream: bool = False
-    ) -> Iterator[pydicom.dataset.Dataset]:
+    ) -> Iterator['pydicom.dataset.Dataset']:
         """Gets instances of a given DICOM series.
 
         Parameters
@@ -2094,16 +2611,12 @@ class DICOMwebClient(object):
             data sets
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of series.'
-            )
-        self._assert_uid_format(study_instance_uid)
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of series.'
-            )
-        self._assert_uid_format(series_instance_uid)
+        self._assert_uids_are_provided(
+            'retrieval of series',
+            study_instance_uid,
+            series_instance_uid,
+            validate=True
+        )
         url = self._get_series_url(
             'wado', study_instance_uid, series_instance_uid
         )
@@ -2129,7 +2642,7 @@ class DICOMwebClient(object):
         study_instance_uid: str,
         series_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None
-    ) -> List[pydicom.dataset.Dataset]:
+    ) -> List['pydicom.dataset.Dataset']:
         """Retrieves instances of a given DICOM series.
 
         Parameters
@@ -2152,7 +2665,7 @@ class DICOMwebClient(object):
                 study_instance_uid=study_instance_uid,
                 series_instance_uid=series_instance_uid,
                 media_types=media_types,
-                stream=False
+                stream=True
             )
         )
 
@@ -2161,7 +2674,7 @@ class DICOMwebClient(object):
         study_instance_uid: str,
         series_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None
-    ) -> Iterator[pydicom.dataset.Dataset]:
+    ) -> Iterator['pydicom.dataset.Dataset']:
         """Iterates over retrieved instances of a given DICOM series.
 
         Parameters
@@ -2211,23 +2724,17 @@ class DICOMwebClient(object):
             metadata in DICOM JSON format
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'series metadata.'
-            )
-        self._assert_uid_format(study_instance_uid)
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of '
-                'series metadata.'
-            )
-        self._assert_uid_format(series_instance_uid)
+        self._assert_uids_are_provided(
+            'retrieval of series metadata',
+            study_instance_uid,
+            series_instance_uid,
+            validate=True
+        )
         url = self._get_series_url(
             'wado', study_instance_uid, series_instance_uid
         )
         url += '/metadata'
-        return self._http_get_application_json(url)
+        return self._http_get_metadata(url)
 
     def retrieve_series_rendered(
         self, study_instance_uid,
@@ -2258,16 +2765,11 @@ class DICOMwebClient(object):
             rendered series
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'rendered series.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of '
-                'rendered series.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of rendered series',
+            study_instance_uid,
+            series_instance_uid
+        )
         url = self._get_series_url(
             'wado', study_instance_uid, series_instance_uid
         )
@@ -2319,14 +2821,11 @@ class DICOMwebClient(object):
         This method performs a DELETE and should be used with caution.
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-              'Study Instance UID is required for deletion of a series.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for deletion of a series.'
-            )
+        self._assert_uids_are_provided(
+            'deletion of a series',
+            study_instance_uid,
+            series_instance_uid
+        )
         url = self._get_series_url('delete', study_instance_uid,
                                    series_instance_uid)
         return self._http_delete(url)
@@ -2373,7 +2872,8 @@ class DICOMwebClient(object):
         The server may only return a subset of search results. In this case,
         a warning will notify the client that there are remaining results.
         Remaining results can be requested via repeated calls using the
-        `offset` parameter.
+        `offset` parameter. Large values of `limit` are requested in pages
+        of 500 results via concurrent requests.
 
         """ # noqa
         if study_instance_uid is not None:
@@ -2384,7 +2884,7 @@ class DICOMwebClient(object):
         params = self._parse_qido_query_parameters(
             fuzzymatching, limit, offset, fields, search_filters
         )
-        return self._http_get_application_json(url, params)
+        return self._search(url, params)
 
     def retrieve_instance(
         self,
@@ -2392,7 +2892,7 @@ class DICOMwebClient(object):
         series_instance_uid: str,
         sop_instance_uid: str,
         media_types: Optional[Tuple[Union[str, Tuple[str, str]]]] = None,
-    ) -> pydicom.dataset.Dataset:
+    ) -> 'pydicom.dataset.Dataset':
         """Retrieves an individual DICOM instance.
 
         Parameters
@@ -2413,21 +2913,13 @@ class DICOMwebClient(object):
             data set
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of instance.'
-            )
-        self._assert_uid_format(study_instance_uid)
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of instance.'
-            )
-        self._assert_uid_format(series_instance_uid)
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for retrieval of instance.'
-            )
-        self._assert_uid_format(sop_instance_uid)
+        self._assert_uids_are_provided(
+            'retrieval of instance',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid,
+            validate=True
+        )
         url = self._get_instances_url(
             'wado', study_instance_uid, series_instance_uid, sop_instance_uid
         )
@@ -2438,7 +2930,11 @@ class DICOMwebClient(object):
                     f'Media type "{common_media_type}" is not supported for '
                     'retrieval of an instance. It must be "application/dicom".'
                 )
-        iterator = self._http_get_multipart_application_dicom(url, media_types)
+        iterator = self._http_get_multipart_application_dicom(
+            url,
+            media_types,
+            stream=True
+        )
         instances = list(iterator)
         if len(instances) > 1:
             # This should not occur, but safety first.
@@ -2447,7 +2943,7 @@ class DICOMwebClient(object):
 
     def store_instances(
         self,
-        datasets: Sequence[pydicom.dataset.Dataset],
+        datasets: Sequence['pydicom.dataset.Dataset'],
         study_instance_uid: Optional[str] = None
     ) -> Dict[str, dict]:
         """Stores DICOM instances.
@@ -2466,12 +2962,7 @@ class DICOMwebClient(object):
 
         """
         url = self._get_studies_url('stow', study_instance_uid)
-        encoded_datasets = list()
-        for ds in datasets:
-            with BytesIO() as b:
-                pydicom.dcmwrite(b, ds)
-                encoded_ds = b.getvalue()
-            encoded_datasets.append(encoded_ds)
+        encoded_datasets = list(self._map_parts(datasets, _encode_dataset))
         return self._http_post_multipart_application_dicom(
             url,
             encoded_datasets
@@ -2509,18 +3000,12 @@ class DICOMwebClient(object):
         This method performs a DELETE and should be used with caution.
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-              'Study Instance UID is required for deletion of an instance.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for deletion of an instance.'
-            )
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for deletion of an instance.'
-            )
+        self._assert_uids_are_provided(
+            'deletion of an instance',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid
+        )
         url = self._get_instances_url('delete', study_instance_uid,
                                       series_instance_uid, sop_instance_uid)
         return self._http_delete(url)
@@ -2548,26 +3033,17 @@ class DICOMwebClient(object):
             metadata in DICOM JSON format
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'instance metadata.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of '
-                'instance metadata.'
-            )
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for retrieval of '
-                'instance metadata.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of instance metadata',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid
+        )
         url = self._get_instances_url(
             'wado', study_instance_uid, series_instance_uid, sop_instance_uid
         )
         url += '/metadata'
-        return self._http_get_application_json(url)[0]
+        return self._http_get_metadata(url)[0]
 
     def retrieve_instance_rendered(
         self,
@@ -2602,21 +3078,12 @@ class DICOMwebClient(object):
             rendered representation of instance
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'rendered instance.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of '
-                'rendered instance.'
-            )
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for retrieval of '
-                'rendered instance.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of rendered instance',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid
+        )
         url = self._get_instances_url(
             'wado', study_instance_uid, series_instance_uid, sop_instance_uid
         )
@@ -2673,22 +3140,16 @@ class DICOMwebClient(object):
             pixel data for each frame
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of frames.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of frames.'
-            )
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for retrieval of frames.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of frames',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid
+        )
         url = self._get_instances_url(
             'wado', study_instance_uid, series_instance_uid, sop_instance_uid
         )
-        frame_list = ','.join([str(n) for n in frame_numbers])
+        frame_list = ','.join(map(str, frame_numbers))
         url += f'/frames/{frame_list}'
         if media_types is None:
             return self._http_get_multipart_application_octet_stream(
@@ -2749,6 +3210,12 @@ class DICOMwebClient(object):
         List[bytes]
             pixel data for each frame
 
+        Note
+        ----
+        All frames are held in memory at once. Use
+        :meth:`iter_instance_frames` to process frames one at a time as they
+        are received.
+
         """
         return list(
             self._get_instance_frames(
@@ -2757,7 +3224,7 @@ class DICOMwebClient(object):
                 sop_instance_uid=sop_instance_uid,
                 frame_numbers=frame_numbers,
                 media_types=media_types,
-                stream=False
+                stream=True
             )
         )
 
@@ -2843,26 +3310,17 @@ class DICOMwebClient(object):
         Not all media types are compatible with all SOP classes.
 
         """
-        if study_instance_uid is None:
-            raise ValueError(
-                'Study Instance UID is required for retrieval of '
-                'rendered frame.'
-            )
-        if series_instance_uid is None:
-            raise ValueError(
-                'Series Instance UID is required for retrieval of '
-                'rendered frame.'
-            )
-        if sop_instance_uid is None:
-            raise ValueError(
-                'SOP Instance UID is required for retrieval of rendered frame.'
-            )
+        self._assert_uids_are_provided(
+            'retrieval of rendered frame',
+            study_instance_uid,
+            series_instance_uid,
+            sop_instance_uid
+        )
         url = self._get_instances_url(
             'wado', study_instance_uid, series_instance_uid, sop_instance_uid
         )
-        url += '/frames/{frame_numbers}/rendered'.format(
-            frame_numbers=','.join([str(n) for n in frame_numbers])
-        )
+        frame_list = ','.join(map(str, frame_numbers))
+        url += f'/frames/{frame_list}/rendered'
         if media_types is None:
             # Try and hope for the best...
             response = self._http_get(url, params)
@@ -2879,8 +3337,9 @@ class DICOMwebClient(object):
             )
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def lookup_keyword(
-        tag: Union[str, int, Tuple[str, str], pydicom.tag.Tag]
+        tag: Union[str, int, Tuple[str, str], 'pydicom.tag.Tag']
     ) -> str:
         """Looks up the keyword of a DICOM attribute.
 
@@ -2895,9 +3354,11 @@ class DICOMwebClient(object):
             attribute keyword (e.g. ``"SOPInstanceUID"``)
 
         """
+        import pydicom
         return pydicom.datadict.keyword_for_tag(tag)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def lookup_tag(keyword: str) -> str:
         """Looks up the tag of a DICOM attribute.
 
@@ -2912,6 +3373,7 @@ class DICOMwebClient(object):
             attribute tag as HEX string (e.g. ``"00080018"``)
 
         """
+        import pydicom
         tag = pydicom.datadict.tag_for_keyword(keyword)
         tag = pydicom.tag.Tag(tag)
         return '{0:04x}{1:04x}'.format(tag.group, tag.element).upper()
@@ -6,6 +6,7 @@ from typing import Generator, Sequence
 
 import pytest
 import pydicom
+import requests
 from requests.exceptions import HTTPError
 from retrying import RetryError
 
@@ -47,6 +48,19 @@ def test_url(httpserver):
     assert client.stow_url_prefix is None
 
 
+def test_url_default_port():
+    client = DICOMwebClient('https://localhost/dicomweb')
+    assert client.protocol == 'https'
+    assert client.host == 'localhost'
+    assert client.port == 443
+    assert client.url_prefix == '/dicomweb'
+
+
+def test_url_unsupported_scheme():
+    with pytest.raises(ValueError):
+        DICOMwebClient('sss://localhost:8080/dicomweb')
+
+
 def test_url_prefixes(httpserver):
     wado_url_prefix = 'wado'
     qido_url_prefix = 'qido'
@@ -63,6 +77,21 @@ def test_url_prefixes(httpserver):
     assert client.stow_url_prefix == stow_url_prefix
 
 
+def test_resource_urls(httpserver):
+    client = DICOMwebClient(httpserver.url, wado_url_prefix='wado')
+    base_url = httpserver.url
+    assert client._get_studies_url('qido') == f'{base_url}/studies'
+    assert client._get_series_url('qido') == f'{base_url}/series'
+    assert client._get_instances_url('qido') == f'{base_url}/instances'
+    assert client._get_instances_url('wado', '1.2.3', '1.2.4', '1.2.5') == (
+        f'{base_url}/wado/studies/1.2.3/series/1.2.4/instances/1.2.5'
+    )
+    client.wado_url_prefix = 'wadors'
+    assert client._get_series_url('wado', '1.2.3') == (
+        f'{base_url}/wadors/studies/1.2.3/series'
+    )
+
+
 def test_proxies(httpserver):
     protocol = 'http'
     address = 'foo.com'
@@ -71,6 +100,43 @@ def test_proxies(httpserver):
     assert client._session.proxies[protocol] == address
 
 
+def test_pool_maxsize(httpserver):
+    client = DICOMwebClient(httpserver.url)
+    adapter = client._session.get_adapter(httpserver.url)
+    assert adapter._pool_maxsize == 32
+    client = DICOMwebClient(httpserver.url, pool_maxsize=64)
+    adapter = client._session.get_adapter(httpserver.url)
+    assert adapter._pool_maxsize == 64
+
+
+def test_pool_maxsize_session_custom_adapter(httpserver, caplog):
+    class CustomAdapter(requests.adapters.BaseAdapter):
+        pass
+
+    session = requests.Session()
+    session.mount('http://', CustomAdapter())
+    DICOMwebClient(httpserver.url, session=session, pool_maxsize=4)
+    adapter = session.get_adapter(httpserver.url)
+    assert isinstance(adapter, requests.adapters.HTTPAdapter)
+    assert adapter._pool_maxsize == 4
+    assert 'CustomAdapter' in caplog.text
+
+
+def test_max_concurrency(httpserver):
+    client = DICOMwebClient(httpserver.url, max_concurrency=64)
+    adapter = client._session.get_adapter(httpserver.url)
+    assert adapter._pool_maxsize == 64
+    with pytest.raises(ValueError):
+        DICOMwebClient(httpserver.url, max_concurrency=0)
+
+
+def test_pool_maxsize_session(httpserver):
+    session = requests.Session()
+    adapter = session.get_adapter(httpserver.url)
+    DICOMwebClient(httpserver.url, session=session)
+    assert session.get_adapter(httpserver.url) is adapter
+
+
 def test_headers(httpserver):
     name = 'my-token'
     value = 'topsecret'
@@ -88,6 +154,17 @@ def test_lookup_tag(httpserver, client):
     assert client.lookup_tag('PixelData') == '7FE00010'
 
 
+def test_lookup_tag_cache(httpserver, client):
+    hits = DICOMwebClient.lookup_tag.cache_info().hits
+    assert client.lookup_tag('SOPInstanceUID') == '00080018'
+    assert client.lookup_tag('SOPInstanceUID') == '00080018'
+    assert DICOMwebClient.lookup_tag.cache_info().hits > hits
+    # Exceptions are not cached, so an unknown keyword raises repeatedly.
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            client.lookup_tag('NotAKeyword')
+
+
 def test_lookup_keyword(httpserver, client):
     assert client.lookup_keyword('0020000D') == 'StudyInstanceUID'
     assert client.lookup_keyword('0020000E') == 'SeriesInstanceUID'
@@ -192,6 +269,51 @@ def test_search_for_studies_limit_offset(httpserver, client, cache_dir):
     )
 
 
+def test_search_for_studies_paged(httpserver, cache_dir):
+    cache_filename = str(cache_dir.joinpath('search_for_studies.json'))
+    with open(cache_filename, 'r') as f:
+        data = json.loads(f.read())
+    content = json.dumps(data[:2])
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    client = DICOMwebClient(httpserver.url, max_concurrency=1)
+    url = client._get_studies_url('qido')
+    params = client._parse_qido_query_parameters(limit=4, offset=1)
+    assert client._search(url, params, page_size=2) == 2 * parsed_content
+    query_strings = [r.query_string.decode() for r in httpserver.requests]
+    assert query_strings == ['limit=2&offset=1', 'limit=2&offset=3']
+
+
+def test_search_for_studies_paged_incomplete(httpserver, client, cache_dir):
+    cache_filename = str(cache_dir.joinpath('search_for_studies.json'))
+    with open(cache_filename, 'r') as f:
+        data = json.loads(f.read())
+    content = json.dumps(data[:1])
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    assert client.search_for_studies(limit=1000) == parsed_content
+    assert len(httpserver.requests) == 1
+    request = httpserver.requests[0]
+    assert request.query_string.decode() == 'limit=500&offset=0'
+
+
+def test_search_for_studies_paged_offset_ignored(httpserver, cache_dir):
+    cache_filename = str(cache_dir.joinpath('search_for_studies.json'))
+    with open(cache_filename, 'r') as f:
+        data = json.loads(f.read())
+    content = json.dumps(data[:3])
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    client = DICOMwebClient(httpserver.url)
+    url = client._get_studies_url('qido')
+    params = client._parse_qido_query_parameters(limit=6)
+    assert client._search(url, params, page_size=2) == parsed_content
+    assert len(httpserver.requests) == 1
+
+
 def test_search_for_series(httpserver, client, cache_dir):
     cache_filename = str(cache_dir.joinpath('search_for_series.json'))
     with open(cache_filename, 'r') as f:
@@ -220,6 +342,15 @@ def test_search_for_series_wrong_uid_value(httpserver, client, cache_dir):
         client.search_for_series(study_instance_uid=study_instance_uid)
 
 
+def test_retrieve_series_metadata_missing_uid(httpserver, client):
+    with pytest.raises(ValueError, match='Series Instance UID is required'):
+        client.retrieve_series_metadata('1.2.3', None)
+    with pytest.raises(ValueError, match='invalid format'):
+        client.retrieve_series_metadata('1.2.3', '1_2_4')
+    with pytest.raises(TypeError):
+        client.retrieve_series_metadata(1.2, '1.2.4')
+
+
 def test_search_for_series_limit_offset(httpserver, client, cache_dir):
     cache_filename = str(cache_dir.joinpath('search_for_series.json'))
     with open(cache_filename, 'r') as f:
@@ -297,6 +428,18 @@ def test_search_for_instances_includefields(httpserver, client, cache_dir):
     )
 
 
+def test_search_for_instances_includefields_order(httpserver, client):
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content='', code=200, headers=headers)
+    f1 = 'StudyInstanceUID'
+    f2 = 'SeriesInstanceUID'
+    client.search_for_instances(fields=[f2, f1, f2])
+    request = httpserver.requests[0]
+    assert request.query_string.decode() == (
+        'includefield={}&includefield={}'.format(f2, f1)
+    )
+
+
 def test_retrieve_instance_metadata(httpserver, client, cache_dir):
     cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
     with open(cache_filename, 'r') as f:
@@ -324,6 +467,43 @@ def test_retrieve_instance_metadata(httpserver, client, cache_dir):
     )
 
 
+def test_retrieve_instance_metadata_with_orjson(httpserver, client,
+                                                cache_dir, monkeypatch):
+    import orjson
+    orjson_loads = orjson.loads
+    decoded_contents = []
+
+    def loads(content):
+        decoded_content = orjson_loads(content)
+        decoded_contents.append(decoded_content)
+        return decoded_content
+
+    monkeypatch.setattr('dicomweb_client.api._HAS_ORJSON', True)
+    monkeypatch.setattr('dicomweb_client.api.orjson.loads', loads)
+    cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
+    with open(cache_filename, 'r') as f:
+        content = f.read()
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    result = client.retrieve_instance_metadata('1.2.3', '1.2.4', '1.2.5')
+    assert result == parsed_content[0]
+    assert decoded_contents == [parsed_content]
+
+
+def test_retrieve_instance_metadata_without_orjson(httpserver, client,
+                                                   cache_dir, monkeypatch):
+    monkeypatch.setattr('dicomweb_client.api._HAS_ORJSON', False)
+    cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
+    with open(cache_filename, 'r') as f:
+        content = f.read()
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    result = client.retrieve_instance_metadata('1.2.3', '1.2.4', '1.2.5')
+    assert result == parsed_content[0]
+
+
 def test_retrieve_instance_metadata_wado_prefix(httpserver, client, cache_dir):
     client.wado_url_prefix = 'wadors'
     cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
@@ -347,6 +527,52 @@ def test_retrieve_instance_metadata_wado_prefix(httpserver, client, cache_dir):
     assert request.path == expected_path
 
 
+def test_retrieve_instance_metadata_cache(httpserver, cache_dir):
+    client = DICOMwebClient(httpserver.url, metadata_cache_size=2)
+    cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
+    with open(cache_filename, 'r') as f:
+        content = f.read()
+    parsed_content = json.loads(content)
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    study_instance_uid = '1.2.3'
+    series_instance_uid = '1.2.4'
+    sop_instance_uid = '1.2.5'
+    result = client.retrieve_instance_metadata(
+        study_instance_uid, series_instance_uid, sop_instance_uid
+    )
+    assert result == parsed_content[0]
+    result.clear()
+    result = client.retrieve_instance_metadata(
+        study_instance_uid, series_instance_uid, sop_instance_uid
+    )
+    assert result == parsed_content[0]
+    assert len(httpserver.requests) == 1
+    client.retrieve_series_metadata(study_instance_uid, series_instance_uid)
+    assert len(httpserver.requests) == 2
+
+
+def test_retrieve_metadata_cache_eviction(httpserver, cache_dir):
+    client = DICOMwebClient(httpserver.url, metadata_cache_size=1)
+    cache_filename = str(cache_dir.joinpath('retrieve_instance_metadata.json'))
+    with open(cache_filename, 'r') as f:
+        content = f.read()
+    headers = {'content-type': 'application/dicom+json'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    client.retrieve_study_metadata('1.2.3')
+    client.retrieve_study_metadata('1.2.3')
+    assert len(httpserver.requests) == 1
+    client.retrieve_study_metadata('1.2.4')
+    client.retrieve_study_metadata('1.2.3')
+    assert len(httpserver.requests) == 3
+    assert len(client._metadata_cache) == 1
+
+
+def test_metadata_cache_size_negative(httpserver):
+    with pytest.raises(ValueError):
+        DICOMwebClient(httpserver.url, metadata_cache_size=-1)
+
+
 def test_iter_series(client, httpserver, cache_dir):
     cache_filename = str(cache_dir.joinpath('file.dcm'))
     with open(cache_filename, 'rb') as f:
@@ -434,6 +660,40 @@ def test_retrieve_series(client, httpserver, cache_dir):
     assert len(response) == n_resources
 
 
+def test_retrieve_series_codec_workers(httpserver, cache_dir):
+    cache_filename = str(cache_dir.joinpath('file.dcm'))
+    with open(cache_filename, 'rb') as f:
+        data = f.read()
+    dataset = pydicom.dcmread(BytesIO(data))
+    sop_instance_uids = [f'1.2.5.{i}' for i in range(10)]
+    encoded_datasets = []
+    for uid in sop_instance_uids:
+        dataset.SOPInstanceUID = uid
+        with BytesIO() as fp:
+            pydicom.dcmwrite(fp, dataset)
+            encoded_datasets.append(fp.getvalue())
+    headers = {
+        'content-type': (
+            'multipart/related; '
+            'type="application/dicom"; '
+            'boundary="boundary"'
+        ),
+    }
+    message = DICOMwebClient._encode_multipart_message(
+        content=encoded_datasets,
+        content_type=headers['content-type']
+    )
+    httpserver.serve_content(content=message, code=200, headers=headers)
+    client = DICOMwebClient(httpserver.url, codec_workers=3)
+    response = client.retrieve_series('1.2.3', '1.2.4')
+    assert [ds.SOPInstanceUID for ds in response] == sop_instance_uids
+
+
+def test_codec_workers_not_positive(httpserver):
+    with pytest.raises(ValueError):
+        DICOMwebClient(httpserver.url, codec_workers=0)
+
+
 def test_retrieve_instance(httpserver, client, cache_dir):
     cache_filename = str(cache_dir.joinpath('file.dcm'))
     with open(cache_filename, 'rb') as f:
@@ -638,6 +898,65 @@ def test_retrieve_instance_frames_jpeg(httpserver, client, cache_dir):
     assert request.accept_mimetypes[0][0][:36] == headers['content-type'][:36]
 
 
+def test_retrieve_instance_frames_octet_stream_crlf(httpserver, client):
+    media_type = 'application/octet-stream'
+    headers = {
+        'content-type': (
+            'multipart/related; '
+            f'type="{media_type}"; '
+            'boundary="boundary"'
+        ),
+    }
+    frames = [b'\x00\r\n\r\n\x01', b'\r\n\r\n', b'\x02' * 10]
+    message = DICOMwebClient._encode_multipart_message(
+        content=frames,
+        content_type=headers['content-type']
+    )
+    httpserver.serve_content(content=message, code=200, headers=headers)
+    result = client.retrieve_instance_frames(
+        '1.2.3', '1.2.4', '1.2.5',
+        frame_numbers=[1, 2, 3],
+        media_types=(media_type, )
+    )
+    assert result == frames
+
+
+def test_iter_instance_frames_small_chunks(httpserver):
+    media_type = 'application/octet-stream'
+    headers = {
+        'content-type': (
+            'multipart/related; '
+            f'type="{media_type}"; '
+            'boundary="boundary"'
+        ),
+        'transfer-encoding': 'chunked'
+    }
+    frames = [bytes(range(256)) * 4, b'\r\n--bound', b'\xff' * 1000]
+    message = DICOMwebClient._encode_multipart_message(
+        content=frames,
+        content_type=headers['content-type']
+    )
+    chunked_message = _chunk_message(message, 10)
+    httpserver.serve_content(content=chunked_message, code=200, headers=headers)
+    client = DICOMwebClient(httpserver.url, chunk_size=7)
+    iterator = client.iter_instance_frames(
+        '1.2.3', '1.2.4', '1.2.5',
+        frame_numbers=[1, 2, 3],
+        media_types=(media_type, )
+    )
+    assert list(iterator) == frames
+
+
+def test_extract_part_content():
+    data = b'xx\r\nContent-Type: image/jpeg\r\n\r\n\xff\xd8\r\n\r\nyy'
+    content = DICOMwebClient._extract_part_content(data, 2, len(data) - 2)
+    assert content == b'\xff\xd8\r\n\r\n'
+    assert DICOMwebClient._extract_part_content(b'--') is None
+    assert DICOMwebClient._extract_part_content(b'xx--\r\n', 2) is None
+    with pytest.raises(ValueError):
+        DICOMwebClient._extract_part_content(b'Content-Type: image/jpeg')
+
+
 def test_retrieve_instance_frames_jpeg_default_transfer_syntax(httpserver,
                                                                client,
                                                                cache_dir):
@@ -736,6 +1055,43 @@ def test_retrieve_instance_frames_rendered_jpeg_transfer_syntax(httpserver,
         )
 
 
+def test_retrieve_instance_frames_rendered_text(httpserver, client):
+    with pytest.raises(ValueError):
+        client.retrieve_instance_frames_rendered(
+            study_instance_uid='1.2.3',
+            series_instance_uid='1.2.4',
+            sop_instance_uid='1.2.5',
+            frame_numbers=[1],
+            media_types=('text/html', )
+        )
+
+
+def test_retrieve_instance_frames_unsupported_media_type(httpserver, client):
+    with pytest.raises(ValueError, match='retrieval of frames'):
+        client.retrieve_instance_frames(
+            study_instance_uid='1.2.3',
+            series_instance_uid='1.2.4',
+            sop_instance_uid='1.2.5',
+            frame_numbers=[1],
+            media_types=('application/pdf', )
+        )
+
+
+def test_retrieve_instance_rendered_pdf(httpserver, client):
+    content = b'%PDF-1.4'
+    headers = {'content-type': 'application/pdf'}
+    httpserver.serve_content(content=content, code=200, headers=headers)
+    result = client.retrieve_instance_rendered(
+        study_instance_uid='1.2.3',
+        series_instance_uid='1.2.4',
+        sop_instance_uid='1.2.5',
+        media_types=('application/pdf', )
+    )
+    assert result == content
+    request = httpserver.requests[0]
+    assert request.accept_mimetypes[0][0] == 'application/pdf'
+
+
 def test_retrieve_instance_frames_rendered_png(httpserver, client, cache_dir):
     cache_filename = str(cache_dir.joinpath('retrieve_instance_pixeldata.png'))
     with open(cache_filename, 'rb') as f:
@@ -766,6 +1122,52 @@ def test_retrieve_instance_frames_rendered_png(httpserver, client, cache_dir):
     assert request.accept_mimetypes[0][0][:10] == headers['content-type'][:10]
 
 
+def test_encode_multipart_message_parts(cache_dir):
+    cache_filename = str(cache_dir.joinpath('file.dcm'))
+    with open(cache_filename, 'rb') as f:
+        data = f.read()
+    content_type = (
+        'multipart/related; type="application/dicom"; boundary="boundary"'
+    )
+    chunks = DICOMwebClient._encode_multipart_message_parts(
+        content=[data, data],
+        content_type=content_type
+    )
+    assert len(chunks) == 5
+    assert chunks[1] is data
+    assert chunks[3] is data
+    assert chunks[-1] == b'\r\n--boundary--'
+    assert b''.join(chunks) == DICOMwebClient._encode_multipart_message(
+        content=[data, data],
+        content_type=content_type
+    )
+
+
+def test_store_instances_codec_workers(httpserver):
+    client = DICOMwebClient(httpserver.url, codec_workers=2)
+    datasets = []
+    encoded_datasets = []
+    for i in range(5):
+        dataset = load_json_dataset({})
+        dataset.is_little_endian = True
+        dataset.is_implicit_VR = True
+        dataset.PatientID = f'PATIENT{i}'
+        datasets.append(dataset)
+        with BytesIO() as fp:
+            pydicom.dcmwrite(fp, dataset)
+            encoded_datasets.append(fp.getvalue())
+    httpserver.serve_content(content='', code=200, headers='')
+    client.store_instances(datasets)
+    request = httpserver.requests[0]
+    positions = [request.data.index(e) for e in encoded_datasets]
+    assert positions == sorted(positions)
+    client.close()
+    assert client._codec_executor is None
+    client.store_instances(datasets)
+    assert client._codec_executor is not None
+    client.close()
+
+
 def test_store_instance_error_with_retries(httpserver, client, cache_dir):
     dataset = load_json_dataset({})
     dataset.is_little_endian = True
@@ -952,3 +1354,26 @@ def test_load_xml_response(httpserver, client, cache_dir):
         dataset = _load_xml_dataset(tree)
     assert dataset.RetrieveURL.startswith('https://wadors.hospital.com')
     assert len(dataset.ReferencedSOPSequence) == 2
+    assert len(dataset.FailedSOPSequence) == 2
+    assert dataset.FailedSOPSequence[1].ReferencedSOPInstanceUID == (
+        '2.16.124.113543.6003.1011758472.49886.19426.2085542309'
+    )
+
+
+def test_load_xml_dataset_nested_sequence():
+    depth = 2000
+    element = ET.Element('NativeDicomModel')
+    parent = element
+    for _ in range(depth):
+        attribute = ET.SubElement(
+            parent, 'DicomAttribute', vr='SQ', keyword='ContentSequence'
+        )
+        parent = ET.SubElement(attribute, 'Item')
+    attribute = ET.SubElement(
+        parent, 'DicomAttribute', vr='UT', keyword='TextValue'
+    )
+    ET.SubElement(attribute, 'Value').text = 'leaf'
+    dataset = _load_xml_dataset(element)
+    for _ in range(depth):
+        dataset = dataset.ContentSequence[0]
+    assert dataset.TextValue == 'leaf'